@@ -2,9 +2,25 @@
 Test cases for the Loan Calculator module.
 """
 
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
 import pytest
 
-from loan_calculator import LoanCalculator
+from loan_calculator import (
+    MAX_PAYMENT,
+    MAX_PERIODS,
+    LoanCalculator,
+    _pv_kernel,
+    _round_cents,
+    batch_main,
+    calculate_present_value,
+    calculate_present_value_batch,
+    calculate_present_value_batch_f32,
+)
 
 
 class TestPresentValueCalculation:
@@ -23,6 +39,13 @@ class TestPresentValueCalculation:
         pv = LoanCalculator.calculate_present_value(500, 0.0, 24, 12)
         assert pv == 500 * 24
 
+    def test_zero_interest_rate_rounds_to_cents(self):
+        """Test that zero-rate results are rounded to cents and returned as floats."""
+        assert LoanCalculator.calculate_present_value(0.333, 0, 3, 12) == 1.0
+        pv = LoanCalculator.calculate_present_value(1000, 0.0, 60, 12)
+        assert type(pv) is float
+        assert pv == 60000.0
+
     def test_high_interest_rate(self):
         """Test calculation with high interest rate."""
         # Higher interest means lower present value
@@ -53,6 +76,14 @@ class TestPresentValueCalculation:
         assert pv > 0
         assert abs(pv - 418922.48) < 10.0
 
+    def test_matches_annuity_formula(self):
+        """Test results against the standard PV annuity formula."""
+        # PV = PMT × [(1 - (1 + r)^-n) / r]
+        assert LoanCalculator.calculate_present_value(1000, 0.05, 60, 12) == 52990.71
+        assert LoanCalculator.calculate_present_value(500, 0.06, 60, 12) == 25862.78
+        assert LoanCalculator.calculate_present_value(3000, 0.08, 40, 4) == 82066.44
+        assert LoanCalculator.calculate_present_value(12000, 0.05, 5, 1) == 51953.72
+
 
 class TestPaymentValidation:
     """Tests for payment validation."""
@@ -72,6 +103,11 @@ class TestPaymentValidation:
         with pytest.raises(ValueError, match="Payment must be positive"):
             LoanCalculator.calculate_present_value(-100, 0.05, 60, 12)
 
+    def test_nan_payment(self):
+        """Test that a NaN payment raises error."""
+        with pytest.raises(ValueError, match="Payment must be positive"):
+            LoanCalculator.calculate_present_value(float("nan"), 0.05, 60, 12)
+
     def test_excessive_payment(self):
         """Test that excessively large payment raises error."""
         with pytest.raises(ValueError, match="Payment cannot exceed"):
@@ -82,6 +118,16 @@ class TestPaymentValidation:
         with pytest.raises(ValueError, match="Payment must be a number"):
             LoanCalculator.calculate_present_value("1000", 0.05, 60, 12)
 
+    def test_boolean_payment(self):
+        """Test that a boolean payment is rejected rather than treated as 1."""
+        with pytest.raises(ValueError, match="Payment must be a number"):
+            LoanCalculator.calculate_present_value(True, 0.05, 60, 12)
+
+    def test_float_subclass_payment(self):
+        """Test that float subclasses such as NumPy scalars are accepted."""
+        pv = LoanCalculator.calculate_present_value(np.float64(1000), 0.05, 60, 12)
+        assert pv == 52990.71
+
 
 class TestInterestRateValidation:
     """Tests for interest rate validation."""
@@ -99,6 +145,11 @@ class TestInterestRateValidation:
         with pytest.raises(ValueError, match="Interest rate cannot be negative"):
             LoanCalculator.calculate_present_value(1000, -0.05, 60, 12)
 
+    def test_nan_rate(self):
+        """Test that a NaN rate raises error."""
+        with pytest.raises(ValueError, match="Interest rate cannot be negative"):
+            LoanCalculator.calculate_present_value(1000, float("nan"), 60, 12)
+
     def test_excessive_rate(self):
         """Test that excessively high rate raises error."""
         with pytest.raises(ValueError, match="Interest rate cannot exceed"):
@@ -109,15 +160,19 @@ class TestInterestRateValidation:
         with pytest.raises(ValueError, match="Interest rate must be a number"):
             LoanCalculator.calculate_present_value(1000, "0.05", 60, 12)
 
+    def test_boolean_rate(self):
+        """Test that a boolean rate is rejected."""
+        with pytest.raises(ValueError, match="Interest rate must be a number"):
+            LoanCalculator.calculate_present_value(1000, False, 60, 12)
+
 
 class TestPeriodsValidation:
     """Tests for periods validation."""
 
-    def test_valid_periods(self):
+    @pytest.mark.parametrize("periods", [1, 60, 360])
+    def test_valid_periods(self, periods):
         """Test that valid period counts are accepted."""
-        LoanCalculator.calculate_present_value(1000, 0.05, 60, 12)
-        LoanCalculator.calculate_present_value(1000, 0.05, 1, 12)
-        LoanCalculator.calculate_present_value(1000, 0.05, 360, 12)
+        LoanCalculator.calculate_present_value(1000, 0.05, periods, 12)
 
     def test_zero_periods(self):
         """Test that zero periods raises error."""
@@ -139,15 +194,19 @@ class TestPeriodsValidation:
         with pytest.raises(ValueError, match="Periods must be an integer"):
             LoanCalculator.calculate_present_value(1000, 0.05, 60.5, 12)
 
+    def test_boolean_periods(self):
+        """Test that boolean periods are rejected."""
+        with pytest.raises(ValueError, match="Periods must be an integer"):
+            LoanCalculator.calculate_present_value(1000, 0.05, True, 12)
+
 
 class TestPeriodsPerYearValidation:
     """Tests for periods per year validation."""
 
-    def test_valid_periods_per_year(self):
+    @pytest.mark.parametrize("freq", [1, 2, 4, 12, 52, 365])
+    def test_valid_periods_per_year(self, freq):
         """Test that valid periods per year are accepted."""
-        valid_frequencies = [1, 2, 4, 12, 52, 365]
-        for freq in valid_frequencies:
-            LoanCalculator.calculate_present_value(1000, 0.05, 60, freq)
+        LoanCalculator.calculate_present_value(1000, 0.05, 60, freq)
 
     def test_invalid_periods_per_year(self):
         """Test that invalid periods per year raises error."""
@@ -159,6 +218,264 @@ class TestPeriodsPerYearValidation:
         with pytest.raises(ValueError, match="Periods per year must be an integer"):
             LoanCalculator.calculate_present_value(1000, 0.05, 60, 12.5)
 
+    def test_loan_errors_reported_before_frequency(self):
+        """Test that per-loan errors take precedence over an invalid frequency."""
+        with pytest.raises(ValueError, match="Payment must be a number"):
+            LoanCalculator.calculate_present_value("x", 0.05, 60, 7)
+
+    def test_boolean_periods_per_year(self):
+        """Test that boolean periods per year are rejected."""
+        with pytest.raises(ValueError, match="Periods per year must be an integer"):
+            LoanCalculator.calculate_present_value(1000, 0.05, 60, True)
+
+
+class TestBatchCalculation:
+    """Tests for batch present value calculation."""
+
+    @pytest.mark.parametrize("freq", [1, 2, 12, 365])
+    def test_matches_scalar_calculation(self, freq):
+        """Test that batch results match the scalar calculation, cent for cent."""
+        rng = np.random.default_rng(freq)
+        # Random loans plus unrounded values just above and below a half cent
+        payments = np.append(rng.uniform(0.01, 1e6, 20_000), [158059.54, 99677.43])
+        rates = np.append(rng.uniform(0.0, 1.0, 20_000), [0.8, 0.8])
+        periods = np.append(rng.integers(1, 601, 20_000), [550, 567])
+        pv = LoanCalculator.calculate_present_value_batch(payments, rates, periods, freq)
+        expected = [
+            LoanCalculator.calculate_present_value(float(p), float(r), int(n), freq)
+            for p, r, n in zip(payments, rates, periods)
+        ]
+        assert pv.tolist() == expected
+
+    def test_half_cent_ties_match_scalar(self):
+        """Test values within an ULP of a half cent round like the scalar path."""
+        pv = LoanCalculator.calculate_present_value_batch([158059.54], [0.8], [550], 1)
+        assert pv[0] == 197574.43
+        pv = LoanCalculator.calculate_present_value_batch([99677.43], [0.8], [567], 2)
+        assert pv[0] == 249193.57
+        pv = LoanCalculator.calculate_present_value_batch([0.125, 0.375], [0.0, 0.0], [1, 1], 12)
+        assert pv.tolist() == [
+            LoanCalculator.calculate_present_value(0.125, 0.0, 1, 12),
+            LoanCalculator.calculate_present_value(0.375, 0.0, 1, 12),
+        ]
+
+    def test_zero_interest_rate(self):
+        """Test that zero-rate loans equal the total of all payments."""
+        pv = LoanCalculator.calculate_present_value_batch(
+            np.array([500.0, 1000.0]), np.array([0.0, 0.05]), np.array([24, 60]), 12
+        )
+        assert pv[0] == 500 * 24
+        assert pv[1] == 52990.71
+
+    def test_spans_multiple_blocks(self):
+        """Test batches larger than one processing block, in any shape."""
+        rng = np.random.default_rng(1)
+        payments = rng.uniform(1.0, 10_000.0, (3, 40_000))
+        rates = rng.uniform(0.0, 0.2, (3, 40_000))
+        rates[:, ::1000] = 0.0
+        periods = rng.integers(1, 601, (3, 40_000))
+        pv = LoanCalculator.calculate_present_value_batch(payments, rates, periods, 12)
+        assert pv.shape == (3, 40_000)
+        for i, j in [(0, 0), (0, 8_191), (0, 8_192), (1, 32_768), (2, 39_999), (2, 1000)]:
+            expected = LoanCalculator.calculate_present_value(
+                float(payments[i, j]), float(rates[i, j]), int(periods[i, j]), 12
+            )
+            assert pv[i, j] == expected
+
+    def test_near_zero_interest_rate_precision(self):
+        """Test that near-zero rates converge to the zero-rate result."""
+        pv = LoanCalculator.calculate_present_value_batch(
+            [1_000_000.0, 1000.0], [1e-9, 1e-12], [60, 600], 12
+        )
+        assert pv.tolist() == [59999999.85, 600000.0]
+
+    def test_accepts_sequences(self):
+        """Test that plain Python sequences are accepted."""
+        pv = LoanCalculator.calculate_present_value_batch([3000], [0.08], [40], 4)
+        assert pv.tolist() == [82066.44]
+
+    def test_empty_portfolio(self):
+        """Test that an empty portfolio gives an empty result."""
+        pv = LoanCalculator.calculate_present_value_batch([], [], [])
+        assert pv.shape == (0,)
+        assert pv.dtype == np.float64
+        assert calculate_present_value_batch_f32([], [], []).shape == (0,)
+
+    def test_mismatched_shapes(self):
+        """Test that arrays of different shapes raise error."""
+        with pytest.raises(ValueError, match="must have the same shape"):
+            LoanCalculator.calculate_present_value_batch([1000, 500], [0.05], [60, 60], 12)
+
+    def test_invalid_payment(self):
+        """Test that an invalid payment anywhere in the batch raises error."""
+        with pytest.raises(ValueError, match="Payment must be positive"):
+            LoanCalculator.calculate_present_value_batch([1000, 0], [0.05, 0.05], [60, 60], 12)
+        with pytest.raises(ValueError, match="Payment must be positive"):
+            LoanCalculator.calculate_present_value_batch([1000, np.nan], [0.05, 0.05], [60, 60], 12)
+        with pytest.raises(ValueError, match="Payment cannot exceed"):
+            LoanCalculator.calculate_present_value_batch([2_000_000_000], [0.05], [60], 12)
+        with pytest.raises(ValueError, match="Payment must be a number"):
+            LoanCalculator.calculate_present_value_batch(["1000"], [0.05], [60], 12)
+
+    def test_invalid_rate(self):
+        """Test that an invalid interest rate anywhere in the batch raises error."""
+        with pytest.raises(ValueError, match="Interest rate cannot be negative"):
+            LoanCalculator.calculate_present_value_batch([1000], [-0.05], [60], 12)
+        with pytest.raises(ValueError, match="Interest rate cannot be negative"):
+            LoanCalculator.calculate_present_value_batch([1000], [np.nan], [60], 12)
+        with pytest.raises(ValueError, match="Interest rate cannot exceed"):
+            LoanCalculator.calculate_present_value_batch([1000], [1.5], [60], 12)
+        with pytest.raises(ValueError, match="Interest rate must be a number"):
+            LoanCalculator.calculate_present_value_batch([1000], ["0.05"], [60], 12)
+
+    def test_invalid_periods(self):
+        """Test that invalid period counts anywhere in the batch raise error."""
+        with pytest.raises(ValueError, match="Periods must be at least"):
+            LoanCalculator.calculate_present_value_batch([1000], [0.05], [0], 12)
+        with pytest.raises(ValueError, match="Periods cannot exceed"):
+            LoanCalculator.calculate_present_value_batch([1000], [0.05], [1000], 12)
+        with pytest.raises(ValueError, match="Periods must be an integer"):
+            LoanCalculator.calculate_present_value_batch([1000], [0.05], [60.5], 12)
+
+    @pytest.mark.parametrize("freq", [1, 2, 4, 12, 52, 365])
+    def test_valid_periods_per_year(self, freq):
+        """Test that every valid frequency is accepted for a whole batch."""
+        pv = LoanCalculator.calculate_present_value_batch(
+            np.full(6, 1000.0), np.linspace(0.0, 0.2, 6), np.full(6, 60), freq
+        )
+        assert np.all(pv > 0)
+
+    def test_invalid_periods_per_year(self):
+        """Test that invalid periods per year raises error."""
+        with pytest.raises(ValueError, match="Periods per year must be"):
+            LoanCalculator.calculate_present_value_batch([1000], [0.05], [60], 7)
+
+
+class TestBatchCalculationFloat32:
+    """Tests for single-precision batch present value calculation."""
+
+    def test_returns_float32(self):
+        """Test that results are single precision."""
+        pv = calculate_present_value_batch_f32([1000.0], [0.05], [60], 12)
+        assert pv.dtype == np.float32
+
+    def test_matches_double_precision(self):
+        """Test that results stay within the documented relative error."""
+        rng = np.random.default_rng(0)
+        payments = rng.uniform(0.01, 1e9, 10_000)
+        rates = rng.uniform(0.0, 1.0, 10_000)
+        periods = rng.integers(1, 601, 10_000)
+        for freq in [1, 12, 365]:
+            pv32 = calculate_present_value_batch_f32(payments, rates, periods, freq)
+            pv64 = calculate_present_value_batch(payments, rates, periods, freq)
+            assert np.allclose(pv32, pv64, rtol=5e-7, atol=0.01)
+
+    def test_zero_and_tiny_rates(self):
+        """Test zero and near-zero rates in single precision."""
+        pv = calculate_present_value_batch_f32(
+            [500.0, 1000.0], [0.0, 1e-9], np.array([24, 60], dtype=np.int32), 12
+        )
+        assert pv.tolist() == [12000.0, 60000.0]
+
+    def test_invalid_inputs(self):
+        """Test that the batch validation is applied."""
+        with pytest.raises(ValueError, match="Payment must be positive"):
+            calculate_present_value_batch_f32([0.0], [0.05], [60], 12)
+        with pytest.raises(ValueError, match="Periods per year must be"):
+            calculate_present_value_batch_f32([1000.0], [0.05], [60], 7)
+
+
+class TestCalculatorInstance:
+    """Tests for calculators bound to a payment frequency."""
+
+    def test_matches_static_calculation(self):
+        """Test that instance results match the static calculation."""
+        calculator = LoanCalculator(periods_per_year=4)
+        assert calculator.pv(3000, 0.08, 40) == 82066.44
+        assert calculator.pv(1000, 0.05, 61) == calculate_present_value(1000, 0.05, 61, 4)
+
+    def test_default_monthly(self):
+        """Test that instances default to monthly payments."""
+        assert LoanCalculator().pv(1000, 0.05, 60) == 52990.71
+
+    def test_invalid_periods_per_year(self):
+        """Test that an invalid frequency is rejected at construction."""
+        with pytest.raises(ValueError, match="Periods per year must be"):
+            LoanCalculator(periods_per_year=7)
+
+    def test_periods_per_year_is_read_only(self):
+        """Test that the validated frequency cannot be replaced after construction."""
+        calculator = LoanCalculator(periods_per_year=4)
+        assert calculator.periods_per_year == 4
+        with pytest.raises(AttributeError):
+            calculator.periods_per_year = 7
+        assert calculator.pv(3000, 0.08, 40) == 82066.44
+
+    def test_validates_inputs(self):
+        """Test that per-loan inputs are still validated."""
+        with pytest.raises(ValueError, match="Payment must be positive"):
+            LoanCalculator().pv(0, 0.05, 60)
+
+    def test_no_instance_dict(self):
+        """Test that instances use slots rather than a __dict__."""
+        assert not hasattr(LoanCalculator(), "__dict__")
+
+
+class TestBatchMain:
+    """Tests for the CSV batch command-line entry point."""
+
+    def test_prices_each_line(self, monkeypatch, capsys):
+        """Test that each CSV line produces one present value."""
+        monkeypatch.setattr(sys, "stdin", io.StringIO("1000,5,60\n500,6,60\n2000,0,24\n"))
+        batch_main()
+        assert capsys.readouterr().out.split() == ["52990.71", "25862.78", "48000.00"]
+
+    def test_single_line(self, monkeypatch, capsys):
+        """Test that a single loan is handled."""
+        monkeypatch.setattr(sys, "stdin", io.StringIO("3000,8,40\n"))
+        batch_main()
+        assert capsys.readouterr().out.split() == ["105027.10"]
+
+    def test_invalid_input(self, monkeypatch):
+        """Test that invalid loans exit with an error message."""
+        monkeypatch.setattr(sys, "stdin", io.StringIO("1000,5,0\n"))
+        with pytest.raises(SystemExit, match="Error: Periods must be at least"):
+            batch_main()
+
+    @pytest.mark.filterwarnings("error")
+    def test_empty_input(self, monkeypatch, capsys):
+        """Test that empty input produces no output and no warning."""
+        monkeypatch.setattr(sys, "stdin", io.StringIO(""))
+        batch_main()
+        assert capsys.readouterr().out == ""
+
+    def test_rejects_unknown_arguments(self):
+        """Test that the command line rejects arguments other than --batch."""
+        result = subprocess.run(
+            [sys.executable, "loan_calculator.py", "--bach"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        )
+        assert result.returncode == 2
+        assert "unrecognized arguments: --bach" in result.stderr
+
+
+class TestModuleImport:
+    """Tests for module import cost."""
+
+    def test_import_does_not_load_numpy(self):
+        """Test that the scalar path and CLI do not pay for importing NumPy."""
+        code = "import sys, loan_calculator; print('numpy' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        )
+        assert result.stdout.strip() == "False"
+
 
 class TestEdgeCases:
     """Tests for edge cases and boundary conditions."""
@@ -174,12 +491,26 @@ class TestEdgeCases:
         pv = LoanCalculator.calculate_present_value(1000, 0.0001, 60, 12)
         assert pv > 0
 
+    def test_near_zero_interest_rate_precision(self):
+        """Test that near-zero rates converge to the zero-rate result."""
+        pv = LoanCalculator.calculate_present_value(1_000_000, 1e-9, 60, 12)
+        assert pv == 59999999.85
+        pv = LoanCalculator.calculate_present_value(1000, 1e-12, 600, 12)
+        assert pv == 600000.0
+
     def test_rounding(self):
         """Test that result is properly rounded to 2 decimal places."""
         pv = LoanCalculator.calculate_present_value(1000, 0.05, 60, 12)
         # Check that we have at most 2 decimal places
         assert pv == round(pv, 2)
 
+    def test_cent_rounding_matches_round(self):
+        """Test that integer-cent rounding agrees with round(x, 2), including ties."""
+        values = [0.0, 0.005, 0.015, 0.125, 1.005, 2.675, 995.845, 52990.705, 6e11 + 0.125]
+        values += [i * 0.0007 for i in range(20_000)]
+        for value in values:
+            assert _round_cents(value) == round(value, 2)
+
     def test_maximum_valid_values(self):
         """Test with maximum valid values."""
         pv = LoanCalculator.calculate_present_value(
@@ -206,6 +537,31 @@ class TestCalculatorConsistency:
         pv2 = LoanCalculator.calculate_present_value(2000, 0.05, 60, 12)
         assert abs(pv2 - (2 * pv1)) < 0.01
 
+    def test_module_functions_match_class(self):
+        """Test that the class namespace exposes the module-level functions."""
+        assert LoanCalculator.calculate_present_value is calculate_present_value
+        assert LoanCalculator.calculate_present_value_batch is calculate_present_value_batch
+        assert calculate_present_value(1000, 0.05, 60, 12) == 52990.71
+
+    def test_class_exposes_validation_limits(self):
+        """Test that the validation limits remain available on the class."""
+        assert LoanCalculator.MAX_PAYMENT == MAX_PAYMENT
+        assert LoanCalculator.MAX_PERIODS == MAX_PERIODS
+
+    def test_repeated_inputs_use_cache(self):
+        """Test that repeated inputs are served from the calculation cache."""
+        _pv_kernel.cache_clear()
+        pv1 = LoanCalculator.calculate_present_value(1000, 0.05, 61, 12)
+        pv2 = LoanCalculator.calculate_present_value(1000, 0.05, 61, 12)
+        assert pv1 == pv2
+        assert _pv_kernel.cache_info().hits == 1
+
+    def test_precomputed_terms_match_formula(self):
+        """Test that precomputed rate/term combinations match the general formula."""
+        for annual_rate, periods in [(0.0025, 12), (0.04, 360), (0.2, 60)]:
+            pv = LoanCalculator.calculate_present_value(1000, annual_rate, periods, 12)
+            assert pv == _pv_kernel(1000, annual_rate / 12, periods)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])